@@ -6,6 +6,8 @@ Copy this file to your project and customize:
 2. Import your models before calling create_db_and_tables()
 """
 
+import os
+
 from sqlmodel import SQLModel, create_engine, Session
 from typing import Generator
 
@@ -16,10 +18,11 @@ from typing import Generator
 DATABASE_URL = "sqlite:///./database.db"
 
 # Create engine
-# echo=True logs SQL queries (disable in production)
+# echo logs every SQL query through Python logging, which adds overhead
+# to each query - it's off unless SQL_ECHO is set (e.g. SQL_ECHO=1)
 engine = create_engine(
     DATABASE_URL,
-    echo=True,
+    echo=bool(os.getenv("SQL_ECHO")),
     connect_args={"check_same_thread": False}  # SQLite only
 )
 
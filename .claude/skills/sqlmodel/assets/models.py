@@ -6,6 +6,7 @@ Customize and expand based on your needs.
 """
 
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import func
 from typing import Optional, List
 from datetime import datetime
 
@@ -15,11 +16,24 @@ from datetime import datetime
 # =============================================================================
 
 class TimestampMixin(SQLModel):
-    """Add created_at and updated_at to any model."""
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    """
+    Add created_at and updated_at to any model.
+
+    Timestamps are filled in by the database (server_default / onupdate
+    with func.now()), so no Python call runs per insert and the columns
+    are left out of the INSERT. Use sa_column_kwargs rather than
+    sa_column: a mixin's Column object can't be shared between tables.
+    created_at stays None in Python until the row is refreshed or read
+    back with RETURNING.
+    """
+    created_at: Optional[datetime] = Field(
+        default=None,
+        nullable=False,
+        sa_column_kwargs={"server_default": func.now()}
+    )
     updated_at: Optional[datetime] = Field(
         default=None,
-        sa_column_kwargs={"onupdate": datetime.utcnow}
+        sa_column_kwargs={"onupdate": func.now()}
     )
 
 
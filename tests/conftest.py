@@ -3,67 +3,219 @@ Test configuration and fixtures.
 
 This file is automatically discovered by pytest and provides fixtures
 that can be used across all test files.
+
+The app and its database session are async, so the tests are async too.
+They run on anyio's pytest plugin (installed with FastAPI's anyio dependency)
+and talk to the app through httpx.AsyncClient.
 """
 
+from contextvars import ContextVar
+
 import pytest
-from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.pool import StaticPool
 
-from main import app, get_session
+from main import Task, app, get_session
 
 
-@pytest.fixture(name="session")
-def session_fixture():
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """
+    Run all async tests and fixtures on asyncio.
+
+    Session scope lets the session-scoped async fixtures below share
+    one event loop with every test.
+    """
+    return "asyncio"
+
+
+# =============================================================================
+# TEST DATABASE
+# =============================================================================
+# One in-memory database for the whole test run.
+#
+# Why in-memory SQLite?
+# - Fast: No disk I/O
+# - Clean: Database disappears after the test run
+#
+# The engine is a module-level constant, so every fixture and test works
+# with the same engine. StaticPool ensures the same connection is reused,
+# which is required for in-memory SQLite - and with one engine for the
+# whole run, that one connection (and its warm page cache) lasts from
+# the first test to the last.
+#
+# Under pytest-xdist (`pytest -n auto`) every worker is its own process
+# and imports this module itself, so each worker gets a private
+# in-memory database - tests on different workers never share state.
+# =============================================================================
+
+_ENGINE = create_async_engine(
+    "sqlite+aiosqlite://",  # Empty = in-memory database
+    poolclass=StaticPool,  # Required for in-memory SQLite
+)
+
+
+@event.listens_for(_ENGINE.sync_engine, "connect")
+def set_test_pragmas(dbapi_connection, connection_record):
     """
-    Create a fresh in-memory database for each test.
+    Keep SQLite's temporary storage in RAM for the test database.
 
-    Why in-memory SQLite?
-    - Fast: No disk I/O
-    - Isolated: Each test gets a fresh database
-    - Clean: Database disappears after test
+    temp_store=MEMORY: temporary tables, indices and sort spills stay in
+    memory instead of going to temp files on disk.
 
-    StaticPool ensures the same connection is reused,
-    which is required for in-memory SQLite.
+    The durability and locking pragmas main.py sets don't apply here: an
+    in-memory database already journals in memory, has no file to sync,
+    and the StaticPool gives it only one connection to lock against.
     """
-    # Create in-memory SQLite engine
-    engine = create_engine(
-        "sqlite://",  # Empty = in-memory database
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,  # Required for in-memory SQLite
-    )
-
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
-
-    # Create and yield session
-    with Session(engine) as session:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+@pytest.fixture(name="engine", scope="session")
+async def engine_fixture():
+    """
+    Create the tables once and provide the shared test engine.
+
+    Why session scope?
+    - Creating the tables (DDL) is the slowest part of the setup
+    - The schema never changes between tests, so we build it only once
+    - The session fixture below rolls back each test's changes
+    """
+    # Create all tables (once per test session)
+    async with _ENGINE.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    yield _ENGINE
+
+    await _ENGINE.dispose()
+
+
+@pytest.fixture(name="session")
+async def session_fixture(engine):
+    """
+    Provide a session whose changes are rolled back after each test.
+
+    How it works:
+    1. Open a connection and begin a transaction on it
+    2. Bind the session to that connection - the session joins the
+       transaction instead of starting its own
+    3. session.commit() in the endpoints doesn't commit the outer
+       transaction (SQLAlchemy only commits transactions it started)
+    4. After the test, rolling back the outer transaction undoes
+       everything the test wrote
+
+    A rollback is much cheaper than deleting rows or recreating tables,
+    and every test still starts with an empty database.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection)
+
         yield session
 
+        await session.close()
+        await transaction.rollback()
 
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
+
+@pytest.fixture(name="make_tasks")
+def make_tasks_fixture(session: AsyncSession):
     """
-    Create a test client with overridden database session.
+    Insert tasks straight through the test session and return their IDs.
 
-    How dependency override works:
-    1. We tell FastAPI: "When get_session is called, use our test session instead"
-    2. All endpoints now use the test database
-    3. After the test, we clear the override
+    Use this for setup data instead of POSTing to the API - it skips the
+    HTTP round-trip, request parsing and one commit per task.
 
-    This ensures tests don't affect the real database.
+    Usage:
+        task_id, other_id = await make_tasks({"title": "A"}, {"title": "B"})
+
+    Why flush and not commit?
+    - flush() sends one batch of INSERTs and assigns the IDs
+    - The rows are already visible to the endpoints (same session)
+    - The session fixture rolls everything back after the test anyway
+
+    Why return IDs instead of Task objects?
+    - The endpoints commit, which expires loaded objects, and touching an
+      expired attribute would trigger a lazy load (not allowed in async)
+    """
+
+    async def make_tasks(*tasks: dict) -> list[int]:
+        db_tasks = [Task(**fields) for fields in tasks]
+        session.add_all(db_tasks)
+        await session.flush()
+        return [task.id for task in db_tasks]
+
+    return make_tasks
+
+
+# =============================================================================
+# TEST CLIENT
+# =============================================================================
+# The get_session override is installed once, for the whole run. It
+# returns whatever session the current test's fixture put in the
+# _current_session context variable.
+#
+# Why a context variable?
+# - Switching sessions between tests is a single set(), with no
+#   dict mutation per test
+# - The override never has to be removed mid-run, so we never call
+#   dependency_overrides.clear() and wipe out other fixtures' overrides
+# - anyio runs async fixtures and tests in the same task, so the
+#   value set in a fixture is the one the test's requests see
+# =============================================================================
+
+_current_session: ContextVar[AsyncSession] = ContextVar("current_session")
+
+
+def get_session_override() -> AsyncSession:
+    """Use the current test's session instead of the real database."""
+    return _current_session.get()
+
+
+@pytest.fixture(name="test_client", scope="session")
+async def test_client_fixture():
     """
+    Create a single async HTTP client shared by every test.
+
+    ASGITransport sends requests straight into the app - no server,
+    no sockets and no extra thread per request.
 
-    # Override the get_session dependency
-    def get_session_override():
-        return session
+    The app is a module-level singleton, so there's no need for a new
+    client per test - only the session behind the override changes
+    between tests (see the client fixture below).
 
+    ASGITransport doesn't run the app's lifespan, which is what we want:
+    it would create the real tasks.db.
+    """
     app.dependency_overrides[get_session] = get_session_override
 
-    # Create test client
-    client = TestClient(app)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+    # Remove only our override - leave any others in place
+    app.dependency_overrides.pop(get_session, None)
+
+
+@pytest.fixture(name="client")
+async def client_fixture(session: AsyncSession, test_client: AsyncClient):
+    """
+    Provide the shared test client with the database session overridden.
+
+    How it works:
+    1. get_session is already overridden for the whole run (see above)
+    2. We point the override at this test's rolled-back session
+    3. After the test, we restore the previous value
+
+    This ensures tests don't affect the real database.
+    """
+    token = _current_session.set(session)
+
+    yield test_client
 
-    yield client
+    _current_session.reset(token)
 
-    # Clean up: remove the override
-    app.dependency_overrides.clear()
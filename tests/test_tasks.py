@@ -2,22 +2,54 @@
 Tests for Task CRUD API endpoints.
 
 Test naming convention: test_<action>_<scenario>
-Example: test_create_task_success, test_get_task_not_found
+Example: test_create_task_success, test_task_not_found
 """
 
-from fastapi.testclient import TestClient
+import orjson
+import pytest
+from httpx import AsyncClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from main import Task
+
+# Run every test in this module as an async test (see anyio_backend in conftest.py)
+pytestmark = pytest.mark.anyio
+
+
+# =============================================================================
+# REQUEST BODIES
+# =============================================================================
+# POST bodies are encoded to JSON bytes once, at import, and sent with
+# content= - httpx doesn't have to serialize a dict on every request.
+# =============================================================================
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+BODY_GROCERIES = orjson.dumps(
+    {"title": "Buy groceries", "description": "Milk and eggs"}
+)
+BODY_MINIMAL = orjson.dumps({"title": "Simple task"})
+BODY_MISSING_TITLE = orjson.dumps({"description": "No title provided"})
+BODY_EMPTY_TITLE = orjson.dumps({"title": ""})
+BODY_DESCRIPTION_TOO_LONG = orjson.dumps(
+    {"title": "Long", "description": "x" * 1001}
+)
+BODY_BULK = orjson.dumps([
+    {"title": "Task 1"},
+    {"title": "Task 2", "description": "Second", "completed": True},
+])
+BODY_BULK_INVALID_ITEM = orjson.dumps([{"title": "Valid"}, {"title": ""}])
+BODY_BULK_EMPTY = orjson.dumps([])
 
 
 # =============================================================================
 # CREATE (POST /tasks)
 # =============================================================================
 
-def test_create_task_success(client: TestClient):
+async def test_create_task_success(client: AsyncClient):
     """Test creating a task with valid data."""
-    response = client.post(
-        "/tasks",
-        json={"title": "Buy groceries", "description": "Milk and eggs"},
-    )
+    response = await client.post("/tasks", content=BODY_GROCERIES, headers=JSON_HEADERS)
 
     assert response.status_code == 201
     data = response.json()
@@ -27,12 +59,9 @@ def test_create_task_success(client: TestClient):
     assert "id" in data  # ID should be auto-generated
 
 
-def test_create_task_minimal(client: TestClient):
+async def test_create_task_minimal(client: AsyncClient):
     """Test creating a task with only required fields."""
-    response = client.post(
-        "/tasks",
-        json={"title": "Simple task"},
-    )
+    response = await client.post("/tasks", content=BODY_MINIMAL, headers=JSON_HEADERS)
 
     assert response.status_code == 201
     data = response.json()
@@ -41,21 +70,80 @@ def test_create_task_minimal(client: TestClient):
     assert data["completed"] is False
 
 
-def test_create_task_missing_title(client: TestClient):
-    """Test that title is required."""
-    response = client.post(
+@pytest.mark.parametrize(
+    ("body", "error_type"),
+    [(BODY_MISSING_TITLE, "missing"), (BODY_EMPTY_TITLE, "string_too_short")],
+    ids=["missing", "empty"],
+)
+async def test_create_task_invalid_title(
+    client: AsyncClient, body: bytes, error_type: str
+):
+    """Test that title is required and can't be empty."""
+    response = await client.post("/tasks", content=body, headers=JSON_HEADERS)
+
+    assert response.status_code == 422  # Validation error (required, min_length=1)
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "title"]  # Points at the failing field
+    assert error["type"] == error_type
+
+
+async def test_create_task_description_too_long(client: AsyncClient):
+    """Test that description is limited to 1000 characters."""
+    response = await client.post(
         "/tasks",
-        json={"description": "No title provided"},
+        content=BODY_DESCRIPTION_TOO_LONG,
+        headers=JSON_HEADERS,
     )
 
-    assert response.status_code == 422  # Validation error
+    assert response.status_code == 422  # Validation error (max_length=1000)
+    assert response.json()["detail"][0]["loc"] == ["body", "description"]
 
 
-def test_create_task_empty_title(client: TestClient):
-    """Test that empty title is rejected."""
-    response = client.post(
+async def test_create_task_malformed_json(client: AsyncClient):
+    """Test that a body that isn't valid JSON is rejected."""
+    response = await client.post(
         "/tasks",
-        json={"title": ""},
+        content=b"not json",
+        headers=JSON_HEADERS,
+    )
+
+    assert response.status_code == 422
+
+
+async def test_create_tasks_bulk_success(client: AsyncClient):
+    """Test creating several tasks in one request."""
+    response = await client.post("/tasks/bulk", content=BODY_BULK, headers=JSON_HEADERS)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [task["title"] for task in data] == ["Task 1", "Task 2"]
+    assert data[1]["description"] == "Second"
+    assert data[1]["completed"] is True
+    assert data[0]["id"] != data[1]["id"]
+
+    # The tasks are saved, not just echoed back
+    assert len((await client.get("/tasks")).json()) == 2
+
+
+async def test_create_tasks_bulk_invalid_item(client: AsyncClient):
+    """Test that one invalid item rejects the whole batch."""
+    response = await client.post(
+        "/tasks/bulk",
+        content=BODY_BULK_INVALID_ITEM,
+        headers=JSON_HEADERS,
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "title"]
+    assert (await client.get("/tasks")).json() == []
+
+
+async def test_create_tasks_bulk_empty(client: AsyncClient):
+    """Test that an empty batch is rejected."""
+    response = await client.post(
+        "/tasks/bulk",
+        content=BODY_BULK_EMPTY,
+        headers=JSON_HEADERS,
     )
 
     assert response.status_code == 422  # Validation error (min_length=1)
@@ -65,21 +153,20 @@ def test_create_task_empty_title(client: TestClient):
 # READ (GET /tasks, GET /tasks/{id})
 # =============================================================================
 
-def test_get_tasks_empty(client: TestClient):
+async def test_get_tasks_empty(client: AsyncClient):
     """Test getting tasks when none exist."""
-    response = client.get("/tasks")
+    response = await client.get("/tasks")
 
     assert response.status_code == 200
     assert response.json() == []
 
 
-def test_get_tasks_with_data(client: TestClient):
+async def test_get_tasks_with_data(client: AsyncClient, make_tasks):
     """Test getting all tasks."""
     # Create two tasks
-    client.post("/tasks", json={"title": "Task 1"})
-    client.post("/tasks", json={"title": "Task 2"})
+    await make_tasks({"title": "Task 1"}, {"title": "Task 2"})
 
-    response = client.get("/tasks")
+    response = await client.get("/tasks")
 
     assert response.status_code == 200
     data = response.json()
@@ -88,17 +175,47 @@ def test_get_tasks_with_data(client: TestClient):
     assert data[1]["title"] == "Task 2"
 
 
-def test_get_task_success(client: TestClient):
+async def test_get_tasks_pagination(client: AsyncClient, make_tasks):
+    """Test limit/offset return one page of tasks in id order."""
+    await make_tasks(*({"title": f"Task {i}"} for i in range(5)))
+
+    response = await client.get("/tasks", params={"limit": 2, "offset": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data] == ["Task 1", "Task 2"]
+
+
+async def test_get_tasks_filter_completed(client: AsyncClient, make_tasks):
+    """Test filtering the task list by completed status."""
+    await make_tasks({"title": "Open"}, {"title": "Done", "completed": True})
+
+    response = await client.get("/tasks", params={"completed": True})
+
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Done"]
+
+    response = await client.get("/tasks", params={"completed": False})
+
+    assert [task["title"] for task in response.json()] == ["Open"]
+
+
+async def test_get_tasks_limit_too_large(client: AsyncClient):
+    """Test that limit is capped at 500."""
+    response = await client.get("/tasks", params={"limit": 501})
+
+    assert response.status_code == 422  # Validation error (le=500)
+
+
+async def test_get_task_success(client: AsyncClient, make_tasks):
     """Test getting a single task by ID."""
     # Create a task first
-    create_response = client.post(
-        "/tasks",
-        json={"title": "Test task", "description": "Test description"},
+    [task_id] = await make_tasks(
+        {"title": "Test task", "description": "Test description"}
     )
-    task_id = create_response.json()["id"]
 
     # Get the task
-    response = client.get(f"/tasks/{task_id}")
+    response = await client.get(f"/tasks/{task_id}")
 
     assert response.status_code == 200
     data = response.json()
@@ -106,26 +223,17 @@ def test_get_task_success(client: TestClient):
     assert data["title"] == "Test task"
 
 
-def test_get_task_not_found(client: TestClient):
-    """Test getting a non-existent task returns 404."""
-    response = client.get("/tasks/999")
-
-    assert response.status_code == 404
-    assert "not found" in response.json()["detail"].lower()
-
-
 # =============================================================================
 # UPDATE (PUT /tasks/{id})
 # =============================================================================
 
-def test_update_task_success(client: TestClient):
+async def test_update_task_success(client: AsyncClient, make_tasks):
     """Test updating a task."""
     # Create a task
-    create_response = client.post("/tasks", json={"title": "Original title"})
-    task_id = create_response.json()["id"]
+    [task_id] = await make_tasks({"title": "Original title"})
 
     # Update it
-    response = client.put(
+    response = await client.put(
         f"/tasks/{task_id}",
         json={"title": "Updated title", "completed": True},
     )
@@ -136,17 +244,15 @@ def test_update_task_success(client: TestClient):
     assert data["completed"] is True
 
 
-def test_update_task_partial(client: TestClient):
+async def test_update_task_partial(
+    client: AsyncClient, session: AsyncSession, make_tasks
+):
     """Test partial update (only some fields)."""
     # Create a task
-    create_response = client.post(
-        "/tasks",
-        json={"title": "Original", "description": "Original desc"},
-    )
-    task_id = create_response.json()["id"]
+    [task_id] = await make_tasks({"title": "Original", "description": "Original desc"})
 
     # Update only completed field
-    response = client.put(
+    response = await client.put(
         f"/tasks/{task_id}",
         json={"completed": True},
     )
@@ -157,53 +263,101 @@ def test_update_task_partial(client: TestClient):
     assert data["description"] == "Original desc"  # Unchanged
     assert data["completed"] is True  # Updated
 
-
-def test_update_task_not_found(client: TestClient):
-    """Test updating a non-existent task returns 404."""
-    response = client.put(
-        "/tasks/999",
-        json={"title": "New title"},
+    # Check the stored row too (expire_all makes get() reload from the DB)
+    session.expire_all()
+    task = await session.get(Task, task_id)
+    assert (task.title, task.description, task.completed) == (
+        "Original",
+        "Original desc",
+        True,
     )
 
-    assert response.status_code == 404
+
+async def test_update_task_empty_body(client: AsyncClient, make_tasks):
+    """Test that an update with no fields leaves the task unchanged."""
+    [task_id] = await make_tasks({"title": "Unchanged"})
+
+    response = await client.put(f"/tasks/{task_id}", json={})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": task_id,
+        "title": "Unchanged",
+        "description": None,
+        "completed": False,
+    }
 
 
 # =============================================================================
 # DELETE (DELETE /tasks/{id})
 # =============================================================================
 
-def test_delete_task_success(client: TestClient):
+async def test_delete_task_success(
+    client: AsyncClient, session: AsyncSession, make_tasks
+):
     """Test deleting a task."""
     # Create a task
-    create_response = client.post("/tasks", json={"title": "To be deleted"})
-    task_id = create_response.json()["id"]
+    [task_id] = await make_tasks({"title": "To be deleted"})
 
     # Delete it
-    response = client.delete(f"/tasks/{task_id}")
+    response = await client.delete(f"/tasks/{task_id}")
 
     assert response.status_code == 204
     assert response.content == b""  # Empty body
 
-    # Verify it's gone
-    get_response = client.get(f"/tasks/{task_id}")
-    assert get_response.status_code == 404
+    # Verify it's gone - straight from the database, no second request.
+    # expire_all() makes sure nothing is answered from the identity map;
+    # selecting only the primary key is a lookup in the id index.
+    session.expire_all()
+    result = await session.exec(select(Task.id).where(Task.id == task_id))
+    assert result.first() is None
+
 
+# =============================================================================
+# NOT FOUND (GET / PUT / DELETE /tasks/{id})
+# =============================================================================
 
-def test_delete_task_not_found(client: TestClient):
-    """Test deleting a non-existent task returns 404."""
-    response = client.delete("/tasks/999")
+@pytest.mark.parametrize(
+    ("method", "body"),
+    [("GET", None), ("PUT", {"title": "New title"}), ("PUT", {}), ("DELETE", None)],
+    ids=["get", "put", "put-empty-body", "delete"],
+)
+async def test_task_not_found(client: AsyncClient, method: str, body: dict | None):
+    """Test that every single-task endpoint returns 404 for a missing task."""
+    response = await client.request(method, "/tasks/999", json=body)
 
     assert response.status_code == 404
+    # Error bodies are tiny and fixed - check the raw bytes, no JSON parse
+    assert b'"detail"' in response.content
+    assert b"not found" in response.content.lower()
 
 
 # =============================================================================
 # HEALTH CHECK
 # =============================================================================
 
-def test_health_check(client: TestClient):
+async def test_health_check(client: AsyncClient):
     """Test the health check endpoint."""
-    response = client.get("/")
+    response = await client.get("/")
 
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
+
+
+async def test_openapi_documents_task_schemas(client: AsyncClient):
+    """Test that task bodies and responses are still documented in OpenAPI."""
+    response = await client.get("/openapi.json")
+
+    assert response.status_code == 200
+    paths = response.json()["paths"]
+    get_task_schema = paths["/tasks/{task_id}"]["get"]["responses"]["200"]
+    assert get_task_schema["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/Task"
+    }
+
+    # Request bodies are documented with TaskCreate, along with the 422
+    create_post = paths["/tasks"]["post"]
+    create_schema = create_post["requestBody"]["content"]["application/json"]["schema"]
+    assert create_schema == {"$ref": "#/components/schemas/TaskCreate"}
+    assert "422" in create_post["responses"]